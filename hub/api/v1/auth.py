@@ -1,11 +1,14 @@
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from nearai.shared.cache import mem_cache_with_timeout
-from nearai.shared.near.sign import validate_nonce, verify_signed_message
+from nearai.shared.near.sign import SignatureVerificationResult, validate_nonce, verify_signed_message
 from pydantic import BaseModel, field_validator
 from sqlmodel import select
 
@@ -82,12 +85,40 @@ def parse_auth(token: Optional[HTTPAuthorizationCredentials] = Depends(bearer)):
         raise TokenValidationError(detail=str(e)) from None
 
 
+# The same signed token is sent on every request, so skip re-verifying the ed25519 signature while it is cached.
+# Only successful verifications are remembered, and the cache is bounded so made-up tokens cannot grow it.
+SIGNATURE_CACHE_TIMEOUT = 300
+SIGNATURE_CACHE_SIZE = 10_000
+_verified_signatures: "OrderedDict[Tuple, float]" = OrderedDict()
+_verified_signatures_lock = threading.Lock()
+
+
+def _cached_verify_signed_message(*args) -> SignatureVerificationResult:
+    now = time.time()
+    with _verified_signatures_lock:
+        verified_at = _verified_signatures.get(args)
+        if verified_at is not None:
+            if now - verified_at < SIGNATURE_CACHE_TIMEOUT:
+                _verified_signatures.move_to_end(args)
+                return SignatureVerificationResult.TRUE
+            del _verified_signatures[args]
+
+    result = verify_signed_message(*args)
+    if result == SignatureVerificationResult.TRUE:
+        with _verified_signatures_lock:
+            _verified_signatures[args] = now
+            _verified_signatures.move_to_end(args)
+            while len(_verified_signatures) > SIGNATURE_CACHE_SIZE:
+                _verified_signatures.popitem(last=False)
+    return result
+
+
 def validate_signature(auth: Optional[RawAuthToken] = Depends(parse_auth)):
     if auth is None:
         return None
 
     logging.debug(f"account_id {auth.account_id}: verifying signature")
-    is_valid = verify_signed_message(
+    is_valid = _cached_verify_signed_message(
         auth.account_id,
         auth.public_key,
         auth.signature,
@@ -458,6 +458,38 @@ class SqlClient:
         self.db.commit()
         return self.get_vector_store(vector_store_id)
 
+    def append_files_to_vector_store(
+        self, vector_store_id: str, file_ids: List[str], account_id: str
+    ) -> Optional[VectorStore]:
+        """Append files to a vector store without rewriting its whole file list.
+
+        The IDs are pushed onto the stored JSON array inside the database, so files attached concurrently
+        are preserved and the existing list is not round-tripped through Python.
+
+        Args:
+        ----
+            vector_store_id (str): The ID of the vector store.
+            file_ids (List[str]): The file IDs to append.
+            account_id (str): The ID of the account.
+
+        Returns:
+        -------
+            Optional[VectorStore]: The updated vector store if successful, None otherwise.
+
+        """
+        cursor = self.db.cursor()
+        # Nesting depth of one UPDATE is bounded so very large imports do not produce an unwieldy expression
+        batch_size = 100
+        for start in range(0, len(file_ids), batch_size):
+            batch = file_ids[start : start + batch_size]
+            expression = "file_ids"
+            for _ in batch:
+                expression = f"JSON_ARRAY_PUSH_STRING({expression}, %s)"
+            query = f"UPDATE vector_stores SET file_ids = {expression} WHERE id = %s AND account_id = %s"
+            cursor.execute(query, (*batch, vector_store_id, account_id))
+        self.db.commit()
+        return self.get_vector_store(vector_store_id)
+
     def store_embedding(
         self, id: str, vector_store_id: str, file_id: str, chunk_index: int, chunk_text: str, embedding: List[float]
     ):
@@ -22,6 +22,7 @@ from hub.tasks.embedding_generation import (
     generate_embedding,
     generate_embeddings_for_file,
     generate_embeddings_for_vector_store,
+    schedule_embedding_generation,
 )
 from hub.tasks.github_import import create_file_from_content, process_github_source
 
@@ -33,15 +34,12 @@ s3_client = boto3.client("s3")
 
 
 @vector_stores_router.post("/vector_stores", response_model=VectorStore)
-async def create_vector_store(
-    request: CreateVectorStoreRequest, background_tasks: BackgroundTasks, auth: AuthToken = Depends(get_auth)
-):
+async def create_vector_store(request: CreateVectorStoreRequest, auth: AuthToken = Depends(get_auth)):
     """Create a new vector store.
 
     Args:
     ----
         request (CreateVectorStoreRequest): The request containing vector store details.
-        background_tasks (BackgroundTasks): FastAPI background tasks.
         auth (AuthToken): The authentication token.
 
     Returns:
@@ -76,7 +74,7 @@ async def create_vector_store(
         expires_at = vector_store.created_at.timestamp() + vector_store.expires_after["days"] * 24 * 60 * 60
 
     logger.info(f"Queueing embedding generation for vector store: {vector_store_id}")
-    background_tasks.add_task(generate_embeddings_for_vector_store, vector_store.id)
+    schedule_embedding_generation(generate_embeddings_for_vector_store(vector_store.id))
 
     logger.info(f"Vector store created successfully: {vector_store_id}")
     return VectorStore(
@@ -238,7 +236,6 @@ async def delete_vector_store(vector_store_id: str, auth: AuthToken = Depends(ge
 async def create_vector_store_file(
     vector_store_id: str,
     file_data: VectorStoreFileCreate,
-    background_tasks: BackgroundTasks,
     auth: AuthToken = Depends(get_auth),
 ):
     """Attach a file to an existing vector store and initiate embedding generation.
@@ -247,7 +244,6 @@ async def create_vector_store_file(
     ----
         vector_store_id (str): The ID of the vector store to attach the file to.
         file_data (VectorStoreFileCreate): The file data containing the file_id to attach.
-        background_tasks (BackgroundTasks): FastAPI background tasks for asynchronous processing.
         auth (AuthToken): The authentication token for the current user.
 
     Returns:
@@ -263,7 +259,7 @@ async def create_vector_store_file(
     Notes:
     -----
         - This function updates the vector store by adding the new file_id to its list of files.
-        - It queues a background task to generate embeddings for the newly attached file.
+        - It schedules a detached task to generate embeddings for the newly attached file.
         - The vector store's status is set to "in_progress" as embedding generation begins.
 
     """
@@ -302,8 +298,8 @@ async def create_vector_store_file(
         )
 
     logger.info(f"Queueing embedding generation for file in vector store: {vector_store_id}")
-    background_tasks.add_task(
-        generate_embeddings_for_file, file_data.file_id, vector_store_id, vector_store.chunking_strategy
+    schedule_embedding_generation(
+        generate_embeddings_for_file(file_data.file_id, vector_store_id, vector_store.chunking_strategy)
     )
     logger.info(f"Embedding generation queued for file: {file_data.file_id}")
 
@@ -562,7 +558,6 @@ class AddUserMemoryResponse(BaseModel):
 @vector_stores_router.post("/vector_stores/memory")
 async def add_user_memory(
     request: AddUserMemoryRequest,
-    background_tasks: BackgroundTasks,
     auth: AuthToken = Depends(get_auth),
 ) -> AddUserMemoryResponse:  # Add explicit return type annotation
     """Add a new memory entry to the user's memory store."""
@@ -590,6 +585,6 @@ async def add_user_memory(
         raise HTTPException(status_code=500, detail="Failed to create file from memory")
 
     file_data = VectorStoreFileCreate(file_id=file_id)
-    await create_vector_store_file(vs.id, file_data, background_tasks, auth)
+    await create_vector_store_file(vs.id, file_data, auth)
 
     return AddUserMemoryResponse(status="success", memory_id=file_id, object="memory.created")
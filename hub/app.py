@@ -1,15 +1,15 @@
 # ruff: noqa: E402  # two blocks of imports makes the linter sad
 import logging
-import os
+import re
 
-from ddtrace import patch_all
 from dotenv import load_dotenv
 
+from hub.tracing import maybe_enable_tracing
+
 # Initialize env vars, logging, and Datadog tracing before any other imports
 load_dotenv()
 
-if os.environ.get("DD_ENABLED"):
-    patch_all()
+maybe_enable_tracing()
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +43,9 @@ from hub.api.v1.stars import v1_router as stars_router
 from hub.api.v1.thread_routes import threads_router
 from hub.api.v1.vector_stores import vector_stores_router
 
+# Collapses the newlines and indentation in exception details into single spaces.
+_WHITESPACE_RE = re.compile(r"\s+")
+
 # No lifespan function - FastAPI will use default behavior
 app = FastAPI(docs_url="/docs/hub/interactive", redoc_url="/docs/hub/reference")
 
@@ -54,6 +57,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers reuse preflight responses for a day instead of re-sending OPTIONS every 10 minutes
+    max_age=86400,
 )
 
 app.include_router(v1_router, prefix="/v1")
@@ -83,8 +88,8 @@ def health():
 
 @app.exception_handler(TokenValidationError)
 async def token_validation_exception_handler(request: Request, exc: TokenValidationError):
-    exc_lines = exc.detail.split("\n")
-    exc_str = f"{exc_lines[0]}: {exc_lines[1]}.{exc_lines[2]}".replace("  ", " ") if len(exc_lines) > 2 else ""
+    exc_lines = exc.detail.split("\n", 3)
+    exc_str = _WHITESPACE_RE.sub(" ", f"{exc_lines[0]}: {exc_lines[1]}.{exc_lines[2]}") if len(exc_lines) > 2 else ""
     logger.info(f"Received invalid Auth Token. {exc_str}")
     # 400 Bad Request if auth request was invalid
     content = {"status_code": 400, "message": exc_str, "data": None}
@@ -93,6 +98,6 @@ async def token_validation_exception_handler(request: Request, exc: TokenValidat
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    exc_str = f"{exc}".replace("\n", " ").replace("   ", " ")
+    exc_str = _WHITESPACE_RE.sub(" ", str(exc))
     content = {"status_code": 422, "message": exc_str, "data": None}
     return JSONResponse(content=content, status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
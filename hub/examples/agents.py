@@ -76,10 +76,12 @@ run = client.beta.threads.runs.create(
 logger.info(f"Run created with ID: {run.id}")
 logger.info(f"Initial run status: {run.status}")
 
-# Wait for the run to complete
+# Wait for the run to complete, polling quickly at first since short runs finish in well under a second
 logger.info("Waiting for the run to complete")
+attempt = 0
 while run.status != "completed":
-    time.sleep(5)
+    time.sleep(min(0.5 * 2**attempt, 5.0))
+    attempt += 1
     run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
     logger.info(f"Current run status: {run.status}")
 
@@ -8,8 +8,9 @@ import requests
 config = nearai.config.load_config_file()
 base_url = config.get("api_url", "https://api.near.ai/") + "v1"
 auth = config["auth"]
+signature = json.dumps(auth)
 
-client = openai.OpenAI(base_url=base_url, api_key=json.dumps(auth))
+client = openai.OpenAI(base_url=base_url, api_key=signature)
 
 # Create a vector store from GitHub source
 github_source = {
@@ -30,7 +31,7 @@ create_request = {
 response = requests.post(
     f"{base_url}/vector_stores/from_source",
     json=create_request,
-    headers={"Authorization": f"Bearer {json.dumps(auth)}"}
+    headers={"Authorization": f"Bearer {signature}"}
 )
 response.raise_for_status()
 vs = response.json()
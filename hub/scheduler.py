@@ -7,7 +7,6 @@ from datetime import datetime
 from functools import partial
 
 from apscheduler.triggers.interval import IntervalTrigger
-from ddtrace import patch_all
 from dotenv import load_dotenv
 from nearai.shared.models import RunMode
 from sqlmodel import select
@@ -19,6 +18,7 @@ from hub.api.v1.thread_routes import RunCreateParamsBase, ThreadModel, _create_t
 from hub.tasks.near_events import near_events_task, process_near_events_initial_state
 from hub.tasks.scheduler import get_async_scheduler
 from hub.tasks.x_event_source import x_events_task
+from hub.tracing import maybe_enable_tracing
 
 # Configure logging
 logging.basicConfig(
@@ -26,8 +26,7 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 
-if os.environ.get("DD_ENABLED"):
-    patch_all()
+maybe_enable_tracing()
 
 
 class WarningFilter(logging.Filter):
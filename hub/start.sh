@@ -23,4 +23,6 @@ fi
 
 sleep 3
 alembic upgrade head
-fastapi run app.py --port 8081
\ No newline at end of file
+# uvicorn picks up uvloop and httptools automatically (installed via fastapi-cli's uvicorn[standard]).
+# Keep a single worker unless the APScheduler job store and local agent runners are moved out of process.
+fastapi run app.py --port 8081 --workers "${HUB_WORKERS:-1}"
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import os
 import uuid
-from typing import List, Optional
+from typing import Coroutine, List, Optional, Set
 
 import openai
 from docx import Document
@@ -26,6 +26,10 @@ OFFICE_EXTENSIONS = [".docx", ".pptx", ".xlsx"]
 
 # Embedding model
 EMBEDDING_MODEL = "nomic-ai/nomic-embed-text-v1.5"
+# Maximum number of chunks embedded concurrently per file
+EMBEDDING_BATCH_SIZE = 64
+# Maximum number of scheduled embedding generation tasks running at once
+EMBEDDING_GENERATION_CONCURRENCY = 4
 
 """
 Chunking strategy:
@@ -39,6 +43,51 @@ The overlap ensures smooth transitions and context preservation between chunks.
 These values may need adjustment based on the specific requirements of the embedding model in use.
 """
 
+# Strong references to in-flight embedding tasks so they are not garbage collected before completion.
+_pending_embedding_tasks: Set[asyncio.Task] = set()
+# Created on first use so it binds to the running event loop.
+_embedding_semaphore: Optional[asyncio.Semaphore] = None
+
+
+async def _run_with_embedding_limit(coro: Coroutine):
+    global _embedding_semaphore
+    if _embedding_semaphore is None:
+        _embedding_semaphore = asyncio.Semaphore(EMBEDDING_GENERATION_CONCURRENCY)
+    try:
+        async with _embedding_semaphore:
+            return await coro
+    finally:
+        # Avoids a "never awaited" warning if the task is cancelled while waiting for the semaphore
+        coro.close()
+
+
+def _on_embedding_task_done(task: asyncio.Task) -> None:
+    _pending_embedding_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Embedding generation failed: {task.exception()}")
+
+
+def schedule_embedding_generation(coro: Coroutine) -> asyncio.Task:
+    """Run an embedding generation coroutine on the event loop, detached from the request that queued it.
+
+    Unlike FastAPI `BackgroundTasks`, which run inside the request's response cycle, the task is scheduled
+    independently so long-running embedding work does not hold the request open. At most
+    `EMBEDDING_GENERATION_CONCURRENCY` scheduled coroutines run at once; the rest wait their turn.
+
+    Args:
+    ----
+        coro (Coroutine): The embedding generation coroutine to run.
+
+    Returns:
+    -------
+        asyncio.Task: The scheduled task.
+
+    """
+    task = asyncio.create_task(_run_with_embedding_limit(coro))
+    _pending_embedding_tasks.add(task)
+    task.add_done_callback(_on_embedding_task_done)
+    return task
+
 
 async def generate_embeddings_for_vector_store(vector_store_id: str):
     """Generate embeddings for all files in a vector store.
@@ -85,8 +134,9 @@ async def generate_embeddings_for_file(file_id: str, vector_store_id: str, chunk
     """
     logger.info(f"Starting embedding generation for file: {file_id}")
 
-    sql_client = SqlClient()
-    file_details = sql_client.get_file_details(file_id)
+    # SqlClient calls block on the database, so run them off the event loop
+    sql_client = await asyncio.to_thread(SqlClient)
+    file_details = await asyncio.to_thread(sql_client.get_file_details, file_id)
     if not file_details:
         logger.error(f"File with id {file_id} not found")
         raise ValueError(f"File with id {file_id} not found")
@@ -95,28 +145,37 @@ async def generate_embeddings_for_file(file_id: str, vector_store_id: str, chunk
     chunks = create_chunks(content, chunking_strategy)
     logger.debug(f"Created {len(chunks)} chunks for file: {file_id}")
 
-    embedding_tasks = [generate_embedding(chunk) for chunk in chunks]
-    embeddings = await asyncio.gather(*embedding_tasks)
-
-    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-        embedding_id = f"vfe_{uuid.uuid4().hex[:24]}"
-        try:
-            sql_client.store_embedding(
-                id=embedding_id,
-                vector_store_id=vector_store_id,
-                file_id=file_id,
-                chunk_index=i,
-                chunk_text=chunk,
-                embedding=embedding,
-            )
-        except Exception as e:
-            logger.error(f"Failed to store embedding: {embedding_id} for file: {file_id}, error: {e}")
-
-    sql_client.update_file_embedding_status(file_id, "completed")
-
-    if embeddings:
-        embedding_dimensions = len(embeddings[0])
-        sql_client.update_vector_store_embedding_info(vector_store_id, EMBEDDING_MODEL, embedding_dimensions)
+    # Embed and store one batch at a time so only a batch of embeddings is held in memory
+    # and the number of concurrent embedding requests stays bounded for large files.
+    embedding_dimensions = None
+    for batch_start in range(0, len(chunks), EMBEDDING_BATCH_SIZE):
+        batch = chunks[batch_start : batch_start + EMBEDDING_BATCH_SIZE]
+        embeddings = await asyncio.gather(*[generate_embedding(chunk) for chunk in batch])
+
+        for i, (chunk, embedding) in enumerate(zip(batch, embeddings), start=batch_start):
+            embedding_id = f"vfe_{uuid.uuid4().hex[:24]}"
+            try:
+                await asyncio.to_thread(
+                    sql_client.store_embedding,
+                    id=embedding_id,
+                    vector_store_id=vector_store_id,
+                    file_id=file_id,
+                    chunk_index=i,
+                    chunk_text=chunk,
+                    embedding=embedding,
+                )
+            except Exception as e:
+                logger.error(f"Failed to store embedding: {embedding_id} for file: {file_id}, error: {e}")
+
+        if embedding_dimensions is None and embeddings:
+            embedding_dimensions = len(embeddings[0])
+
+    await asyncio.to_thread(sql_client.update_file_embedding_status, file_id, "completed")
+
+    if embedding_dimensions is not None:
+        await asyncio.to_thread(
+            sql_client.update_vector_store_embedding_info, vector_store_id, EMBEDDING_MODEL, embedding_dimensions
+        )
 
     logger.info(f"Finished embedding generation for file: {file_id}")
 
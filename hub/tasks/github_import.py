@@ -1,18 +1,22 @@
-import base64
+import asyncio
+import functools
 import logging
 import mimetypes
 import os
+import random
+import threading
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
 
-import chardet
 import requests
+from chardet.universaldetector import UniversalDetector
 from dotenv import load_dotenv
 from nearai.shared.models import GitHubSource
 
 from hub.api.v1.files import upload_file_to_storage
 from hub.api.v1.sql import SqlClient
-from hub.tasks.embedding_generation import generate_embeddings_for_file
+from hub.tasks.embedding_generation import generate_embeddings_for_file, schedule_embedding_generation
 
 """
 This module handles the import of files from GitHub repositories into the vector store.
@@ -27,7 +31,21 @@ load_dotenv()
 
 BASE_URL = "https://api.github.com/repos"
 RATE_LIMIT_WAIT = 60
+MAX_RETRIES = 5
+REQUEST_TIMEOUT = 30
 MAX_CONTENT_LENGTH = 1024 * 1024  # 1 MB
+ENCODING_DETECTION_CHUNK_SIZE = 2048
+BLOB_READ_CHUNK_SIZE = 64 * 1024
+GITHUB_IMPORT_CONCURRENCY = 10
+TREE_CACHE_SIZE = 8
+BINARY_EXTENSIONS = frozenset(
+    {
+        ".7z", ".a", ".bin", ".bmp", ".class", ".dll", ".dylib", ".eot", ".exe", ".gif", ".gz", ".ico", ".jar",
+        ".jpeg", ".jpg", ".mov", ".mp3", ".mp4", ".npy", ".o", ".otf", ".pdf", ".pkl", ".png", ".pt", ".pyc",
+        ".safetensors", ".so", ".tar", ".tgz", ".ttf", ".wasm", ".wav", ".webp", ".whl", ".woff", ".woff2",
+        ".xz", ".zip",
+    }
+)  # fmt: skip
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
@@ -36,11 +54,82 @@ HEADERS = {
     "Accept": "application/vnd.github.v3+json",
 }
 
+# Shared session so concurrent blob fetches reuse pooled keep-alive connections to api.github.com
+# instead of paying a TCP and TLS handshake per request.
+_session = requests.Session()
+_session.mount(
+    "https://",
+    requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=GITHUB_IMPORT_CONCURRENCY),
+)
+
+
+class LRUCache:
+    """A small thread-safe LRU cache; repo trees are fetched from worker threads."""
+
+    def __init__(self, maxsize: int):  # noqa: D107
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:  # noqa: D102
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:  # noqa: D102
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# (owner, repo, branch) -> (ETag, tree). Revalidated with If-None-Match, so a 304 costs no rate limit.
+_tree_cache = LRUCache(TREE_CACHE_SIZE)
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """Check whether a GitHub API response signals a primary or secondary rate limit."""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        response.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in response.headers
+    )
+
+
+def get_rate_limit_wait(response: requests.Response, attempt: int) -> float:
+    """Compute how long to wait before retrying a rate limited request.
+
+    Honors the `Retry-After` and `X-RateLimit-Reset` headers sent by GitHub, and falls back to
+    exponential backoff with jitter when neither is present.
+
+    Args:
+    ----
+        response (requests.Response): The rate limited response.
+        attempt (int): The zero-based retry attempt.
+
+    Returns:
+    -------
+        float: The number of seconds to wait.
+
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+
+    reset = response.headers.get("X-RateLimit-Reset")
+    if response.headers.get("X-RateLimit-Remaining") == "0" and reset and reset.isdigit():
+        return max(float(reset) - time.time(), 0.0) + 1.0
+
+    return min(2**attempt + random.random(), RATE_LIMIT_WAIT)
+
 
 def handle_rate_limit(func):
     """Decorator to handle GitHub API rate limiting.
 
-    If a rate limit is encountered, the function will wait and retry.
+    If a rate limit is encountered, the function will wait and retry up to `MAX_RETRIES` times.
 
     Args:
     ----
@@ -52,25 +141,39 @@ def handle_rate_limit(func):
 
     """
 
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         response = func(*args, **kwargs)
-        if response.status_code == 403:
-            logger.warning(f"Rate limit exceeded. Waiting for {RATE_LIMIT_WAIT} seconds...")
-            time.sleep(RATE_LIMIT_WAIT)
-            return wrapper(*args, **kwargs)
+        for attempt in range(MAX_RETRIES):
+            if not is_rate_limited(response):
+                break
+            wait = get_rate_limit_wait(response, attempt)
+            logger.warning(f"Rate limit exceeded. Waiting for {wait:.1f} seconds...")
+            response.close()
+            time.sleep(wait)
+            response = func(*args, **kwargs)
         return response
 
     return wrapper
 
 
 @handle_rate_limit
-def github_get(url: str, source_auth: Optional[str] = None) -> requests.Response:
+def github_get(
+    url: str,
+    source_auth: Optional[str] = None,
+    etag: Optional[str] = None,
+    accept: Optional[str] = None,
+    stream: bool = False,
+) -> requests.Response:
     """Make a GET request to the GitHub API.
 
     Args:
     ----
         url (str): The GitHub API endpoint URL.
         source_auth (Optional[str]): Optional authentication token.
+        etag (Optional[str]): ETag of a cached response, sent as `If-None-Match`.
+        accept (Optional[str]): Media type to request instead of the default JSON.
+        stream (bool): Whether to defer downloading the response body.
 
     Returns:
     -------
@@ -86,7 +189,11 @@ def github_get(url: str, source_auth: Optional[str] = None) -> requests.Response
         raise ValueError("GitHub token is required")
     if source_auth:
         headers["Authorization"] = f"token {source_auth}"
-    return requests.get(url, headers=headers)
+    if etag:
+        headers["If-None-Match"] = etag
+    if accept:
+        headers["Accept"] = accept
+    return _session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=stream)
 
 
 def get_repo_contents(owner: str, repo: str, branch: str = "main", caller_auth: Optional[str] = None) -> Optional[Dict]:
@@ -105,64 +212,120 @@ def get_repo_contents(owner: str, repo: str, branch: str = "main", caller_auth:
 
     """
     url = f"{BASE_URL}/{owner}/{repo}/git/trees/{branch}?recursive=1"
-    response = github_get(url, caller_auth)
+    cache_key = (owner, repo, branch)
+    cached: Optional[Tuple[str, Dict]] = _tree_cache.get(cache_key)
+    response = github_get(url, caller_auth, etag=cached[0] if cached else None)
+    if response.status_code == 304 and cached:
+        return cached[1]
     if response.status_code == 200:
-        return response.json()
+        contents = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            _tree_cache.put(cache_key, (etag, contents))
+        return contents
     logger.error(f"Error fetching contents: {response.status_code}")
     return None
 
 
-def read_file_content(blob_url: str) -> Optional[str]:
-    """Read the content of a file from a GitHub blob URL.
+def detect_encoding(content: bytes) -> str:
+    """Detect the encoding of the content, stopping as soon as the detector is confident.
+
+    Args:
+    ----
+        content (bytes): The raw file content.
+
+    Returns:
+    -------
+        str: The detected encoding, or "utf-8" if it could not be detected.
+
+    """
+    detector = UniversalDetector()
+    view = memoryview(content)
+    for start in range(0, len(view), ENCODING_DETECTION_CHUNK_SIZE):
+        detector.feed(view[start : start + ENCODING_DETECTION_CHUNK_SIZE].tobytes())
+        if detector.done:
+            break
+    detector.close()
+    return detector.result["encoding"] or "utf-8"
+
+
+def read_file_content(blob_url: str, source_auth: Optional[str] = None) -> Optional[bytes]:
+    """Read the content of a file from a GitHub blob URL as UTF-8 encoded bytes.
+
+    UTF-8 (and so ASCII) content is returned as-is, without decoding to a string and encoding back again.
+    Content in any other encoding is transcoded to UTF-8, as the hub does for uploaded files.
 
     Args:
     ----
         blob_url (str): The GitHub blob URL of the file.
+        source_auth (Optional[str]): Optional authentication token.
 
     Returns:
     -------
-        Optional[str]: The content of the file as a string, or None if the request fails or the file is too large.
+        Optional[bytes]: The UTF-8 content of the file, or None if the request fails, the file is too large
+            or it cannot be decoded as text.
 
     """
-    response = github_get(blob_url)
-    if response.status_code == 200:
-        content = base64.b64decode(response.json()["content"])
-        if len(content) > MAX_CONTENT_LENGTH:
-            logger.warning("File too large, skipping content.")
+    # Request the raw bytes instead of base64 wrapped in JSON, and stop reading once the size limit is exceeded
+    with github_get(blob_url, source_auth, accept="application/vnd.github.raw", stream=True) as response:
+        if response.status_code != 200:
+            logger.error(f"Error fetching file content: {response.status_code}")
             return None
 
-        detected = chardet.detect(content)
-        encoding = detected["encoding"] if detected and detected["encoding"] else "utf-8"
-
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=BLOB_READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_CONTENT_LENGTH:
+                logger.warning("File too large, skipping content.")
+                return None
+            chunks.append(chunk)
+        content = b"".join(chunks)
+
+    # Source files are overwhelmingly UTF-8, so only run the (slow) encoding detection when that fails.
+    # For UTF-8 content decoding only validates that it is text; the decoded string is not kept.
+    try:
+        content.decode("utf-8")
+    except UnicodeDecodeError:
+        encoding = detect_encoding(content)
         try:
-            return content.decode(encoding)
+            content = content.decode(encoding).encode("utf-8")
         except UnicodeDecodeError:
             logger.error(f"Unable to decode content for {blob_url} with {encoding}")
             return None
-    logger.error(f"Error fetching file content: {response.status_code}")
-    return None
 
+    return content
+
+
+@functools.lru_cache(maxsize=1024)
+def guess_content_type(name: str) -> str:
+    """Guess the content type for a lowercased file basename, defaulting to text/plain."""
+    return mimetypes.guess_type(name)[0] or "text/plain"
 
-async def create_file_from_content(account_id: str, filename: str, content: str, purpose: str) -> Optional[str]:
+
+async def create_file_from_content(
+    account_id: str, filename: str, content: Union[str, bytes], purpose: str, encoding: str = "utf-8"
+) -> Optional[str]:
     """Create a file record from content and upload it to storage.
 
     Args:
     ----
         account_id (str): The account ID of the user.
         filename (str): The name of the file.
-        content (str): The content of the file.
+        content (Union[str, bytes]): The content of the file. Bytes are uploaded as-is.
         purpose (str): The purpose of the file.
+        encoding (str): The encoding of the content, used to encode strings and recorded with the file.
 
     Returns:
     -------
         Optional[str]: The file ID if successful, None otherwise.
 
     """
-    content_bytes = content.encode("utf-8")
+    content_bytes = content.encode(encoding) if isinstance(content, str) else content
     file_size = len(content_bytes)
-    content_type = mimetypes.guess_type(filename)[0] or "text/plain"
-
     safe_filename = os.path.basename(filename)
+    content_type = guess_content_type(safe_filename.lower())
+
     object_key = f"vector-store-files/{account_id}/{safe_filename}"
     try:
         file_uri = await upload_file_to_storage(content_bytes, object_key)
@@ -170,16 +333,19 @@ async def create_file_from_content(account_id: str, filename: str, content: str,
         logger.error(f"Failed to upload file to storage: {str(e)}")
         return None
 
-    sql_client = SqlClient()
+    # pymysql is blocking; run database calls in a worker thread so other imports keep making progress.
+    # Each call gets its own SqlClient, as a pymysql connection must not be shared across threads.
+    sql_client = await asyncio.to_thread(SqlClient)
     try:
-        file_id = sql_client.create_file(
+        file_id = await asyncio.to_thread(
+            sql_client.create_file,
             account_id=account_id,
             file_uri=file_uri,
             purpose=purpose,
             filename=safe_filename,
             content_type=content_type,
             file_size=file_size,
-            encoding="utf-8",
+            encoding=encoding,
         )
         return file_id
     except Exception as e:
@@ -187,6 +353,23 @@ async def create_file_from_content(account_id: str, filename: str, content: str,
         return None
 
 
+def should_skip_blob(item: Dict) -> bool:
+    """Check whether a tree entry can be rejected without downloading it.
+
+    Args:
+    ----
+        item (Dict): A blob entry from the GitHub tree listing.
+
+    Returns:
+    -------
+        bool: True if the blob is too large or is a known binary format.
+
+    """
+    if item.get("size", 0) > MAX_CONTENT_LENGTH:
+        return True
+    return os.path.splitext(item["path"])[1].lower() in BINARY_EXTENSIONS
+
+
 async def process_github_source(
     source: GitHubSource, vector_store_id: str, account_id: str, source_auth: Optional[str] = None
 ):
@@ -202,35 +385,57 @@ async def process_github_source(
 
     """
     logger.info(f"Processing GitHub source for vector store: {vector_store_id}")
-    sql_client = SqlClient()
+    # Database calls are blocking, so they run in a worker thread. They are awaited one at a time,
+    # so the connection is never used from two threads at once.
+    sql_client = await asyncio.to_thread(SqlClient)
 
-    repo_contents = get_repo_contents(source.owner, source.repo, source.branch, source_auth)
+    repo_contents = await asyncio.to_thread(get_repo_contents, source.owner, source.repo, source.branch, source_auth)
     if repo_contents is None or "tree" not in repo_contents:
         logger.error(f"Failed to fetch repository contents for {source.owner}/{source.repo}")
         return
 
-    for item in repo_contents["tree"]:
-        if item["type"] != "blob":
-            continue
-
-        content = read_file_content(item["url"])
-        if content is None:
-            continue
-
-        file_id = await create_file_from_content(account_id, item["path"], content, "assistants")
-        if not file_id:
-            continue
-
-        vector_store = sql_client.get_vector_store(vector_store_id)
-        if not vector_store:
-            logger.error(f"Vector store {vector_store_id} not found")
-            continue
+    vector_store = await asyncio.to_thread(sql_client.get_vector_store, vector_store_id)
+    if not vector_store:
+        logger.error(f"Vector store {vector_store_id} not found")
+        return
 
-        sql_client.update_files_in_vector_store(
+    semaphore = asyncio.Semaphore(GITHUB_IMPORT_CONCURRENCY)
+
+    async def process_blob(item: Dict) -> Optional[str]:
+        async with semaphore:
+            content = await asyncio.to_thread(read_file_content, item["url"], source_auth)
+            if content is None:
+                return None
+
+            file_id = await create_file_from_content(account_id, item["path"], content, "assistants")
+            if not file_id:
+                return None
+
+            # Embedding is the slowest step; run it detached so the semaphore only bounds GitHub and storage I/O
+            schedule_embedding_generation(
+                generate_embeddings_for_file(file_id, vector_store_id, vector_store.chunking_strategy)
+            )
+            return file_id
+
+    # The tree listing already carries size and path, so binaries and oversized files are skipped before download
+    blobs = [item for item in repo_contents["tree"] if item["type"] == "blob" and not should_skip_blob(item)]
+    results = await asyncio.gather(*(process_blob(item) for item in blobs), return_exceptions=True)
+
+    new_file_ids = []
+    for item, result in zip(blobs, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to import {item['path']}: {result}")
+        elif result:
+            new_file_ids.append(result)
+
+    if new_file_ids:
+        # Attach all imported files with a single append instead of rewriting file_ids once per file.
+        # The append happens in the database, so files attached while the import was running are preserved.
+        await asyncio.to_thread(
+            sql_client.append_files_to_vector_store,
             vector_store_id=vector_store_id,
-            file_ids=vector_store.file_ids + [file_id],
+            file_ids=new_file_ids,
             account_id=account_id,
         )
-        await generate_embeddings_for_file(file_id, vector_store_id, vector_store.chunking_strategy)
 
     logger.info(f"Completed processing GitHub source for vector store: {vector_store_id}")
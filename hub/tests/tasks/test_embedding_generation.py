@@ -0,0 +1,35 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import hub.tasks.embedding_generation as embedding_generation
+
+
+class TestScheduleEmbeddingGeneration(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):  # noqa: D102
+        embedding_generation._embedding_semaphore = None
+
+    async def asyncTearDown(self):  # noqa: D102
+        embedding_generation._embedding_semaphore = None
+
+    @patch("hub.tasks.embedding_generation.EMBEDDING_GENERATION_CONCURRENCY", 2)
+    async def test_limits_concurrent_tasks(self):  # noqa: D102
+        running = 0
+        max_running = 0
+
+        async def work():
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        tasks = [embedding_generation.schedule_embedding_generation(work()) for _ in range(6)]
+        await asyncio.gather(*tasks)
+        self.assertEqual(max_running, 2)
+
+    async def test_returns_result(self):  # noqa: D102
+        async def work():
+            return "done"
+
+        self.assertEqual(await embedding_generation.schedule_embedding_generation(work()), "done")
@@ -0,0 +1,122 @@
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+import hub.tasks.github_import as github_import
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_is_rate_limited(self):  # noqa: D102
+        self.assertTrue(github_import.is_rate_limited(make_response(429)))
+        self.assertTrue(github_import.is_rate_limited(make_response(403, {"X-RateLimit-Remaining": "0"})))
+        self.assertTrue(github_import.is_rate_limited(make_response(403, {"Retry-After": "5"})))
+
+    def test_forbidden_is_not_rate_limited(self):  # noqa: D102
+        self.assertFalse(github_import.is_rate_limited(make_response(403)))
+        self.assertFalse(github_import.is_rate_limited(make_response(403, {"X-RateLimit-Remaining": "12"})))
+        self.assertFalse(github_import.is_rate_limited(make_response(200)))
+
+    def test_wait_uses_retry_after(self):  # noqa: D102
+        response = make_response(403, {"Retry-After": "7", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"})
+        self.assertEqual(github_import.get_rate_limit_wait(response, 0), 7.0)
+
+    @patch("hub.tasks.github_import.time.time", return_value=1000.0)
+    def test_wait_uses_rate_limit_reset(self, _):  # noqa: D102
+        response = make_response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"})
+        self.assertEqual(github_import.get_rate_limit_wait(response, 0), 31.0)
+
+    def test_wait_falls_back_to_bounded_backoff(self):  # noqa: D102
+        response = make_response(429)
+        self.assertGreaterEqual(github_import.get_rate_limit_wait(response, 0), 1.0)
+        self.assertLess(github_import.get_rate_limit_wait(response, 0), 2.0)
+        self.assertEqual(github_import.get_rate_limit_wait(response, 20), github_import.RATE_LIMIT_WAIT)
+
+    @patch("hub.tasks.github_import.time.sleep")
+    def test_retries_until_not_rate_limited(self, sleep):  # noqa: D102
+        responses = [make_response(429, {"Retry-After": "3"}), make_response(429, {"Retry-After": "4"})]
+        responses.append(make_response(200))
+        func = MagicMock(side_effect=responses)
+
+        response = github_import.handle_rate_limit(func)("url")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [3.0, 4.0])
+
+    @patch("hub.tasks.github_import.time.sleep")
+    def test_gives_up_after_max_retries(self, sleep):  # noqa: D102
+        func = MagicMock(side_effect=lambda *args: make_response(429, {"Retry-After": "1"}))
+
+        response = github_import.handle_rate_limit(func)("url")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(func.call_count, github_import.MAX_RETRIES + 1)
+        self.assertEqual(sleep.call_count, github_import.MAX_RETRIES)
+
+    @patch("hub.tasks.github_import.time.sleep")
+    def test_forbidden_fails_fast(self, sleep):  # noqa: D102
+        func = MagicMock(return_value=make_response(403))
+
+        response = github_import.handle_rate_limit(func)("url")
+
+        self.assertEqual(response.status_code, 403)
+        func.assert_called_once()
+        sleep.assert_not_called()
+
+
+class TestShouldSkipBlob(unittest.TestCase):
+    def test_skips_binary_extensions(self):  # noqa: D102
+        self.assertTrue(github_import.should_skip_blob({"path": "assets/logo.PNG", "size": 10}))
+        self.assertTrue(github_import.should_skip_blob({"path": "model.safetensors", "size": 10}))
+
+    def test_skips_large_blobs(self):  # noqa: D102
+        item = {"path": "data.txt", "size": github_import.MAX_CONTENT_LENGTH + 1}
+        self.assertTrue(github_import.should_skip_blob(item))
+
+    def test_keeps_text_blobs(self):  # noqa: D102
+        self.assertFalse(github_import.should_skip_blob({"path": "src/main.py", "size": 100}))
+        self.assertFalse(github_import.should_skip_blob({"path": "Makefile"}))
+        item = {"path": "README.md", "size": github_import.MAX_CONTENT_LENGTH}
+        self.assertFalse(github_import.should_skip_blob(item))
+
+
+class TestGuessContentType(unittest.TestCase):
+    def test_uses_full_name(self):  # noqa: D102
+        self.assertEqual(github_import.guess_content_type("archive.tar.gz"), "application/x-tar")
+        self.assertEqual(github_import.guess_content_type("main.py"), "text/x-python")
+
+    def test_extensionless_names_default_to_text(self):  # noqa: D102
+        self.assertEqual(github_import.guess_content_type("makefile"), "text/plain")
+        self.assertEqual(github_import.guess_content_type("license"), "text/plain")
+
+
+class TestReadFileContent(unittest.TestCase):
+    def read(self, content):  # noqa: D102
+        response = make_response(200)
+        response.raw = io.BytesIO(content)
+        with patch("hub.tasks.github_import.github_get", return_value=response):
+            return github_import.read_file_content("https://api.github.com/blob", "token")
+
+    def test_utf8_is_returned_as_is(self):  # noqa: D102
+        content = "Caf\u00e9 cr\u00e8me\n".encode("utf-8")
+        self.assertIs(self.read(content), content)
+
+    def test_cp1252_is_transcoded_to_utf8(self):  # noqa: D102
+        text = (
+            "Caf\u00e9 cr\u00e8me br\u00fbl\u00e9e, d\u00e9j\u00e0 vu, na\u00efve fa\u00e7ade \u2013 \u201cquoted\u201d.\n"
+            * 20
+        )
+        self.assertEqual(self.read(text.encode("cp1252")), text.encode("utf-8"))
+
+    def test_too_large(self):  # noqa: D102
+        self.assertIsNone(self.read(b"a" * (github_import.MAX_CONTENT_LENGTH + 1)))
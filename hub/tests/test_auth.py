@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import patch
+
+from nearai.shared.near.sign import SignatureVerificationResult
+
+import hub.api.v1.auth as auth
+
+
+class TestCachedVerifySignedMessage(unittest.TestCase):
+    def setUp(self):  # noqa: D102
+        auth._verified_signatures.clear()
+
+    @patch("hub.api.v1.auth.verify_signed_message", return_value=SignatureVerificationResult.TRUE)
+    def test_caches_valid_signature(self, verify):  # noqa: D102
+        self.assertTrue(auth._cached_verify_signed_message("a.near", "key", "sig"))
+        self.assertTrue(auth._cached_verify_signed_message("a.near", "key", "sig"))
+        self.assertEqual(verify.call_count, 1)
+
+    @patch("hub.api.v1.auth.verify_signed_message", return_value=SignatureVerificationResult.FALSE)
+    def test_does_not_cache_invalid_signature(self, verify):  # noqa: D102
+        self.assertFalse(auth._cached_verify_signed_message("a.near", "key", "bad"))
+        self.assertFalse(auth._cached_verify_signed_message("a.near", "key", "bad"))
+        self.assertEqual(verify.call_count, 2)
+        self.assertEqual(len(auth._verified_signatures), 0)
+
+    @patch("hub.api.v1.auth.verify_signed_message", return_value=SignatureVerificationResult.TRUE)
+    def test_expires_entries(self, verify):  # noqa: D102
+        with patch("hub.api.v1.auth.time.time", return_value=1000.0):
+            auth._cached_verify_signed_message("a.near", "key", "sig")
+        with patch("hub.api.v1.auth.time.time", return_value=1000.0 + auth.SIGNATURE_CACHE_TIMEOUT):
+            auth._cached_verify_signed_message("a.near", "key", "sig")
+        self.assertEqual(verify.call_count, 2)
+
+    @patch("hub.api.v1.auth.SIGNATURE_CACHE_SIZE", 2)
+    @patch("hub.api.v1.auth.verify_signed_message", return_value=SignatureVerificationResult.TRUE)
+    def test_evicts_least_recently_used(self, verify):  # noqa: D102
+        for signature in ("s1", "s2", "s3"):
+            auth._cached_verify_signed_message("a.near", "key", signature)
+        self.assertEqual(list(auth._verified_signatures), [("a.near", "key", "s2"), ("a.near", "key", "s3")])
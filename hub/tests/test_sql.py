@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from hub.api.v1.sql import SqlClient
+
+
+class TestAppendFilesToVectorStore(unittest.TestCase):
+    def setUp(self):  # noqa: D102
+        # Skip __init__, which connects to the database
+        self.client = SqlClient.__new__(SqlClient)
+        self.client.db = MagicMock()
+        self.cursor = self.client.db.cursor.return_value
+
+    @patch.object(SqlClient, "get_vector_store")
+    def test_pushes_ids_in_batches(self, get_vector_store):  # noqa: D102
+        file_ids = [f"file_{i}" for i in range(150)]
+
+        result = self.client.append_files_to_vector_store("vs_1", file_ids, "user.near")
+
+        self.assertEqual(self.cursor.execute.call_count, 2)
+        (first_query, first_args), (second_query, second_args) = [c.args for c in self.cursor.execute.call_args_list]
+        self.assertEqual(first_query.count("JSON_ARRAY_PUSH_STRING("), 100)
+        self.assertEqual(second_query.count("JSON_ARRAY_PUSH_STRING("), 50)
+        self.assertTrue(second_query.startswith("UPDATE vector_stores SET file_ids = JSON_ARRAY_PUSH_STRING("))
+        self.assertIn("(file_ids, %s)", second_query)
+        self.assertTrue(second_query.endswith(" WHERE id = %s AND account_id = %s"))
+        self.assertEqual(first_query.count("%s"), len(first_args))
+        self.assertEqual(first_args, (*file_ids[:100], "vs_1", "user.near"))
+        self.assertEqual(second_args, (*file_ids[100:], "vs_1", "user.near"))
+        self.client.db.commit.assert_called_once()
+        get_vector_store.assert_called_once_with("vs_1")
+        self.assertIs(result, get_vector_store.return_value)
+
+    @patch.object(SqlClient, "get_vector_store")
+    def test_no_files(self, _):  # noqa: D102
+        self.client.append_files_to_vector_store("vs_1", [], "user.near")
+        self.cursor.execute.assert_not_called()
@@ -0,0 +1,12 @@
+import os
+
+
+def maybe_enable_tracing() -> None:
+    """Enable Datadog tracing when DD_ENABLED is set.
+
+    ddtrace is heavy to import, so it is only loaded when tracing is enabled.
+    """
+    if os.environ.get("DD_ENABLED"):
+        from ddtrace import patch_all
+
+        patch_all()
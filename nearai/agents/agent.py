@@ -1,17 +1,20 @@
+import functools
 import io
 import json
-import multiprocessing
 import os
 import platform
+import queue
 import shutil
-import subprocess
 import sys
 import tempfile
+import threading
+import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import CodeType
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 
@@ -20,6 +23,10 @@ from nearai.shared.client_config import ClientConfig
 AGENT_FILENAME_PY = "agent.py"
 AGENT_FILENAME_TS = "agent.ts"
 THREADS_DIR = ".threads"
+FILE_CACHE_READ_WORKERS = 8
+TS_RUNNER_READY_MARKER = ".nearai_ts_runner_ready"
+TS_OUTPUT_FLUSH_LINES = 100
+TS_OUTPUT_FLUSH_INTERVAL = 5.0
 
 load_dotenv()
 
@@ -41,12 +48,113 @@ def clear_module_cache(module_names, namespace):
         namespace: Dictionary namespace for code execution
 
     """
-    cleanup_code = "import sys\n"
+    # The modules are dropped directly rather than by generating and exec-ing cleanup code, which had to be
+    # compiled on every run. `sys` is still bound in the namespace, as the exec-ed `import sys` used to do.
+    namespace["sys"] = sys
     for module_name in module_names:
-        cleanup_code += f"if '{module_name}' in sys.modules:\n"
-        cleanup_code += f"    del sys.modules['{module_name}']\n"
+        sys.modules.pop(module_name, None)
 
-    exec(cleanup_code, namespace)
+
+def read_process_output(stream, stream_name: str, output_queue: "queue.Queue[Tuple[str, Optional[str]]]") -> None:
+    """Queues each non-empty line of a subprocess output stream, then `None` once the stream closes."""
+    with stream:
+        for line in iter(stream.readline, b""):
+            text = line.decode(errors="replace").strip()
+            if text:
+                output_queue.put((stream_name, text))
+    output_queue.put((stream_name, None))
+
+
+def forward_process_output(outputs: Dict[str, Tuple[Any, Optional[Callable[[str], None]]]]) -> None:
+    """Forwards subprocess output streams to their log callbacks until all streams close.
+
+    `outputs` maps a stream name to its stream and log callback. Each stream is read by its own thread, but only the
+    calling thread invokes the callbacks, passing lines in batches of up to `TS_OUTPUT_FLUSH_LINES` or every
+    `TS_OUTPUT_FLUSH_INTERVAL` seconds, and flushing whatever is left when the streams close.
+    """
+    output_queue: "queue.Queue[Tuple[str, Optional[str]]]" = queue.Queue()
+    readers = [
+        threading.Thread(target=read_process_output, args=(stream, stream_name, output_queue), daemon=True)
+        for stream_name, (stream, _) in outputs.items()
+    ]
+    for reader in readers:
+        reader.start()
+
+    pending: Dict[str, List[str]] = {stream_name: [] for stream_name in outputs}
+
+    def flush(stream_name: str) -> None:
+        lines = pending[stream_name]
+        log_callback = outputs[stream_name][1]
+        if lines and log_callback:
+            log_callback(f"[AGENT {stream_name}] " + "\n".join(lines))
+        pending[stream_name] = []
+
+    open_streams = len(readers)
+    deadline = time.monotonic() + TS_OUTPUT_FLUSH_INTERVAL
+    while open_streams:
+        try:
+            stream_name, text = output_queue.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            pass
+        else:
+            if text is None:
+                open_streams -= 1
+            else:
+                pending[stream_name].append(text)
+                if len(pending[stream_name]) >= TS_OUTPUT_FLUSH_LINES:
+                    flush(stream_name)
+        if time.monotonic() >= deadline:
+            for stream_name in pending:
+                flush(stream_name)
+            deadline = time.monotonic() + TS_OUTPUT_FLUSH_INTERVAL
+
+    for stream_name in pending:
+        flush(stream_name)
+    for reader in readers:
+        reader.join()
+
+
+def read_agent_file(file_path: str) -> Optional[bytes]:
+    """Reads an agent file for the file cache, returning None if it cannot be read."""
+    try:
+        with open(file_path, "rb") as f:
+            return f.read()
+    except Exception as e:
+        print(f"Error with cache creation {file_path}: {e}")
+        return None
+
+
+def set_code_filename(code: CodeType, filename: str) -> CodeType:
+    """Returns `code` with `co_filename` set to `filename`, including all nested code objects."""
+    if code.co_filename == filename:
+        return code
+    consts = tuple(
+        set_code_filename(const, filename) if isinstance(const, CodeType) else const for const in code.co_consts
+    )
+    return code.replace(co_filename=filename, co_consts=consts)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_agent_source(source: bytes) -> CodeType:
+    """Compiles agent source, keyed by the source itself so an agent loaded into a new temp dir is not recompiled."""
+    return compile(source, AGENT_FILENAME_PY, "exec")
+
+
+@functools.lru_cache(maxsize=64)
+def compile_agent_code(path: str, mtime_ns: int, size: int) -> CodeType:
+    """Compiles the agent file at `path`.
+
+    `mtime_ns` and `size` are only part of the cache key, so an edited file is compiled again.
+    """
+    with open(path, "rb") as agent_file:
+        source = agent_file.read()
+    try:
+        code = compile_agent_source(source)
+    except SyntaxError as e:
+        e.filename = path
+        raise
+    # Point tracebacks at the file that is actually running
+    return set_code_filename(code, path)
 
 
 def get_local_agent_files(path: Path) -> List[Path]:
@@ -189,10 +297,8 @@ class Agent(object):
         self.code: Optional[CodeType] = None
         self.file_cache: dict[str, Union[str, bytes]] = {}
         self.identifier = identifier
-        name_parts = identifier.split(os.sep)
-        self.namespace = name_parts[0]
-        self.name = name_parts[1]
-        self.version = name_parts[2]
+        # name and version are set from metadata by set_agent_metadata below
+        self.namespace = identifier.split(os.sep, 1)[0]
 
         self.metadata = metadata
         self.env_vars: Dict[str, Any] = {}
@@ -209,12 +315,26 @@ class Agent(object):
         self.original_cwd = os.getcwd()
         self.is_local = local_path is not None
 
-        self.temp_dir = self.write_agent_files_to_temp(agent_files, local_path)
+        # Agent files are written out on first use of `temp_dir`, so agents that never run cost no disk I/O
+        self.local_path = local_path
+        self._temp_dir: Optional[str] = None
         self.ts_runner_dir = ""
         self.change_to_temp_dir = change_to_temp_dir
         self.agent_filename = ""
         self.agent_language = ""
 
+    @property
+    def temp_dir(self) -> str:
+        """Temp dir holding the agent files, written on first access."""
+        if self._temp_dir is None:
+            self._temp_dir = self.write_agent_files_to_temp(self.agent_files, self.local_path)
+        return self._temp_dir
+
+    @property
+    def has_temp_dir(self) -> bool:
+        """Whether the agent files have been written to a temp dir."""
+        return self._temp_dir is not None
+
     def get_full_name(self):
         """Returns full agent name."""
         return f"{self.namespace}/{self.name}/{self.version}"
@@ -246,22 +366,20 @@ class Agent(object):
                 file_path = os.path.join(temp_dir, filename)
 
                 try:
-                    if not os.path.exists(os.path.dirname(file_path)):
-                        os.makedirs(os.path.dirname(file_path))
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
                     if isinstance(content, dict) or isinstance(content, list):
                         try:
                             content = json.dumps(content)
                         except Exception as e:
                             print(f"Error converting content to json: {e}")
-                        content = str(content)
+                            content = str(content)
 
                     if isinstance(content, str):
                         content = content.encode("utf-8")
 
                     with open(file_path, "wb") as f:
-                        with io.BytesIO(content) as byte_stream:
-                            shutil.copyfileobj(byte_stream, f)
+                        f.write(content)
                 except Exception as e:
                     print(f"Error writing file {file_path}: {e}")
                     raise e
@@ -289,12 +407,11 @@ class Agent(object):
         self.welcome_title = welcome.get("title")
         self.welcome_description = welcome.get("description")
 
-        if agent_metadata := details.get("agent", None):
-            if defaults := agent_metadata.get("defaults", None):
-                self.model = defaults.get("model", self.model)
-                self.model_provider = defaults.get("model_provider", self.model_provider)
-                self.model_temperature = defaults.get("model_temperature", self.model_temperature)
-                self.model_max_tokens = defaults.get("model_max_tokens", self.model_max_tokens)
+        if defaults := agent.get("defaults", None):
+            self.model = defaults.get("model", self.model)
+            self.model_provider = defaults.get("model_provider", self.model_provider)
+            self.model_temperature = defaults.get("model_temperature", self.model_temperature)
+            self.model_max_tokens = defaults.get("model_max_tokens", self.model_max_tokens)
 
         if not self.version or not self.name:
             raise ValueError("Both 'version' and 'name' must be non-empty in metadata.")
@@ -373,22 +490,19 @@ class Agent(object):
 
     def run_ts_agent(self, agent_filename, env_vars, json_params, log_stdout_callback=None, log_stderr_callback=None):
         """Launch typescript agent."""
-        print(f"Running typescript agent {agent_filename} from {self.ts_runner_dir}")
+        import subprocess
 
-        # Configure npm to use tmp directories
-        env = os.environ.copy()
-        env.update(
-            {
-                "NPM_CONFIG_CACHE": "/tmp/npm_cache",
-                "NPM_CONFIG_PREFIX": "/tmp/npm_prefix",
-                "HOME": "/tmp",  # Redirect npm home
-                "NPM_CONFIG_LOGLEVEL": "error",  # Suppress warnings, show only errors
-            }
-        )
+        print(f"Running typescript agent {agent_filename} from {self.ts_runner_dir}")
 
-        # Ensure directory structure exists
-        os.makedirs("/tmp/npm_cache", exist_ok=True)
-        os.makedirs("/tmp/npm_prefix", exist_ok=True)
+        # Configure npm to use tmp directories; agent env vars are layered on top for the child process only
+        env = {
+            **os.environ,
+            "NPM_CONFIG_CACHE": "/tmp/npm_cache",
+            "NPM_CONFIG_PREFIX": "/tmp/npm_prefix",
+            "HOME": "/tmp",  # Redirect npm home
+            "NPM_CONFIG_LOGLEVEL": "error",  # Suppress warnings, show only errors
+            **{key: str(value) for key, value in env_vars.items()},
+        }
 
         # read file /tmp/build-info.txt if exists
         if os.path.exists("/var/task/build-info.txt"):
@@ -416,18 +530,14 @@ class Agent(object):
             stdout=subprocess.PIPE,  # Captures standard output from the process
             stderr=subprocess.PIPE,  # Captures standard error
             cwd=self.ts_runner_dir,  # Sets the current working directory for the process
-            env=env_vars,  # Provides custom environment variables to the subprocess
+            env=env,  # Provides npm settings and the agent's environment variables to the subprocess
         )
 
-        stdout, stderr = ts_process.communicate()
-
-        stdout = stdout.decode().strip()
-        if stdout and log_stdout_callback:
-            log_stdout_callback(f"[AGENT STDOUT] {stdout}")
-
-        stderr = stderr.decode().strip()
-        if stderr and log_stderr_callback:
-            log_stderr_callback(f"[AGENT STDERR] {stderr}")
+        # Forward output while it is produced, in batches so that each log call does not become its own upload
+        forward_process_output(
+            {"STDOUT": (ts_process.stdout, log_stdout_callback), "STDERR": (ts_process.stderr, log_stderr_callback)}
+        )
+        ts_process.wait()
 
     def run(
         self, env: Any, task: Optional[str] = None, log_stdout_callback=None, log_stderr_callback=None
@@ -441,8 +551,9 @@ class Agent(object):
             if os.path.exists(os.path.join(self.temp_dir, AGENT_FILENAME_PY)):
                 self.agent_filename = os.path.join(self.temp_dir, AGENT_FILENAME_PY)
                 self.agent_language = "py"
-                with open(self.agent_filename, "r") as agent_file:
-                    self.code = compile(agent_file.read(), self.agent_filename, "exec")
+                # Only recompile agent.py when it has changed on disk since the last run
+                stat = os.stat(self.agent_filename)
+                self.code = compile_agent_code(self.agent_filename, stat.st_mtime_ns, stat.st_size)
             # else, if agent has "agent.ts" file, we use typescript runner
             elif os.path.exists(os.path.join(self.temp_dir, AGENT_FILENAME_TS)):
                 self.agent_filename = os.path.join(self.temp_dir, AGENT_FILENAME_TS)
@@ -454,7 +565,14 @@ class Agent(object):
 
                 ts_runner_actual_path = "/var/task/ts_runner"
 
-                shutil.copytree(ts_runner_actual_path, ts_runner_sdk_dir, symlinks=True, dirs_exist_ok=True)
+                # The runner (including node_modules) is identical for every run, so copy it only once per container
+                ts_runner_ready_marker = os.path.join(ts_runner_sdk_dir, TS_RUNNER_READY_MARKER)
+                if not os.path.exists(ts_runner_ready_marker):
+                    shutil.copytree(ts_runner_actual_path, ts_runner_sdk_dir, symlinks=True, dirs_exist_ok=True)
+                    # npm cache and prefix dirs used by run_ts_agent
+                    os.makedirs("/tmp/npm_cache", exist_ok=True)
+                    os.makedirs("/tmp/npm_prefix", exist_ok=True)
+                    Path(ts_runner_ready_marker).touch()
 
                 # make ts agents dir if not exists
                 if not os.path.exists(ts_runner_agent_dir):
@@ -468,6 +586,7 @@ class Agent(object):
                 raise ValueError(f"Agent run error: {AGENT_FILENAME_PY} or {AGENT_FILENAME_TS} does not exist")
 
             # cache all agent files in file_cache
+            files_to_cache = []
             for root, dirs, files in os.walk(self.temp_dir):
                 is_main_dir = root == self.temp_dir
 
@@ -486,19 +605,20 @@ class Agent(object):
                         # save py file without extension as potential module to import
                         agent_py_modules_import.append(os.path.splitext(os.path.basename(file_path))[0])
 
+                    files_to_cache.append(file_path)
+
+            # Reads release the GIL, so read the files in parallel rather than one after another
+            with ThreadPoolExecutor(max_workers=FILE_CACHE_READ_WORKERS) as executor:
+                for file_path, content in zip(files_to_cache, executor.map(read_agent_file, files_to_cache)):
+                    if content is None:
+                        continue
                     relative_path = os.path.relpath(file_path, self.temp_dir)
                     try:
-                        with open(file_path, "rb") as f:
-                            content = f.read()
-                            try:
-                                # Try to decode as text
-                                self.file_cache[relative_path] = content.decode("utf-8")
-                            except UnicodeDecodeError:
-                                # If decoding fails, store as binary
-                                self.file_cache[relative_path] = content
-
-                    except Exception as e:
-                        print(f"Error with cache creation {file_path}: {e}")
+                        # Try to decode as text
+                        self.file_cache[relative_path] = content.decode("utf-8")
+                    except UnicodeDecodeError:
+                        # If decoding fails, store as binary
+                        self.file_cache[relative_path] = content
 
         else:
             print("Using cached agent code")
@@ -536,6 +656,8 @@ class Agent(object):
                     }
                 )
 
+                import multiprocessing
+
                 process = multiprocessing.Process(
                     target=self.run_ts_agent,
                     args=[
@@ -549,13 +671,31 @@ class Agent(object):
                 process.start()
                 process.join()
             else:
-                if env.agent_runner_user:
-                    process = multiprocessing.Process(
-                        target=self.run_python_code,
-                        args=[namespace, env.agent_runner_user, log_stdout_callback, log_stderr_callback],
-                    )
-                    process.start()
-                    process.join()
+                if env.agent_runner_user and hasattr(os, "fork"):
+                    # Run in a forked child so switching to agent_runner_user does not affect this process.
+                    # A bare fork avoids the multiprocessing machinery, which would have to pickle the namespace
+                    # under a non-fork start method.
+                    pid = os.fork()
+                    if pid == 0:
+                        exit_code = 1
+                        try:
+                            error_message, _ = self.run_python_code(
+                                namespace,
+                                env.agent_runner_user,
+                                agent_py_modules_import,
+                                log_stdout_callback,
+                                log_stderr_callback,
+                            )
+                            exit_code = 0 if error_message is None else 1
+                        finally:
+                            sys.stdout.flush()
+                            sys.stderr.flush()
+                            os._exit(exit_code)
+                    _, status = os.waitpid(pid, 0)
+                    child_exit_code = os.waitstatus_to_exitcode(status)
+                    if child_exit_code != 0:
+                        # The child has already logged the details; a negative code means it was killed by a signal
+                        error_message = f"Agent process exited with code {child_exit_code}"
                 else:
                     error_message, traceback_message = self.run_python_code(
                         namespace,
@@ -1601,7 +1601,7 @@ class Environment(object):
     def clear_temp_agent_files(self, verbose=True) -> None:
         """Remove temp agent files created to be used in `runpy`."""
         for agent in self._agents:
-            if os.path.exists(agent.temp_dir):
+            if agent.has_temp_dir and os.path.exists(agent.temp_dir):
                 if verbose:
                     print("removed agent.temp_files", agent.temp_dir)
                 shutil.rmtree(agent.temp_dir)
@@ -1,3 +1,4 @@
+import copy
 import inspect
 from typing import Any, Callable, Dict, Literal, Optional, _GenericAlias, get_type_hints  # type: ignore
 
@@ -32,6 +33,9 @@ class ToolRegistry:
 
     def __init__(self) -> None:  # noqa: D107
         self.tools: Dict[str, Callable] = {}
+        # Tool definitions are rebuilt from signatures and docstrings, which is slow and happens on every
+        # completion. Keyed by the tool itself so re-registering a name under a new callable is picked up.
+        self._definitions: Dict[Callable, Dict] = {}
 
     def register_tool(self, tool: Callable) -> None:  # noqa: D102
         """Register a tool."""
@@ -62,9 +66,10 @@ class ToolRegistry:
 
     def call_tool(self, name: str, **kwargs: Any) -> Any:  # noqa: D102
         """Call a tool by name."""
-        tool = self.get_tool(name)
-        if tool is None:
-            raise ValueError(f"Tool '{name}' not found.")
+        try:
+            tool = self.tools[name]
+        except KeyError:
+            raise ValueError(f"Tool '{name}' not found.") from None
         return tool(**kwargs)
 
     def get_tool_definition(self, name: str) -> Optional[Dict]:  # noqa: D102
@@ -73,6 +78,14 @@ class ToolRegistry:
         if tool is None:
             return None
 
+        definition = self._definitions.get(tool)
+        if definition is None:
+            definition = self._build_tool_definition(name, tool)
+            self._definitions[tool] = definition
+        # Callers may modify the definition, so never hand out the cached one
+        return copy.deepcopy(definition)
+
+    def _build_tool_definition(self, name: str, tool: Callable) -> Dict:
         assert tool.__doc__ is not None, f"Docstring missing for tool '{name}'."
         docstring = tool.__doc__.strip().split("\n")
 
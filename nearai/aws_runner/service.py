@@ -267,7 +267,7 @@ def load_agent(client, agent: str, params: dict, additional_path: str = "", verb
                     change_to_temp_dir=params.get("change_to_agent_temp_dir", True),
                 )
 
-                print(f"Using {agent} from cache in {full_agent.temp_dir}")
+                print(f"Using {full_agent.identifier} from cache")
                 return full_agent
 
         start_time = time.perf_counter()
@@ -282,7 +282,7 @@ def load_agent(client, agent: str, params: dict, additional_path: str = "", verb
             agent, agent_files, agent_metadata or {}, change_to_temp_dir=params.get("change_to_agent_temp_dir", True)
         )
         local_agent_cache[full_agent.identifier] = full_agent
-        print(f"Saving {full_agent.identifier} from {full_agent.temp_dir} to cache")
+        print(f"Saving {full_agent.identifier} to cache")
         return full_agent
     elif params["data_source"] == "local_files":
         agent = agent.replace(f"{get_registry_folder()}/", "")
@@ -341,7 +341,7 @@ def load_agent(client, agent: str, params: dict, additional_path: str = "", verb
 
 def clear_temp_agent_files(agents, verbose=True):
     for agent in agents:
-        if agent.temp_dir and os.path.exists(agent.temp_dir):
+        if agent.has_temp_dir and os.path.exists(agent.temp_dir):
             if verbose:
                 debug_info = f"""[DEBUG] • Removed agent.temp_dir {agent.temp_dir}
 [DEBUG]
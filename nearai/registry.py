@@ -1,4 +1,5 @@
 import json
+import shutil
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -27,6 +28,7 @@ from nearai.shared.file_encryption import OBFUSCATED_SECRET, FileEncryption
 from nearai.shared.naming import NamespacedName, get_canonical_name
 
 REGISTRY_FOLDER = "registry"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
 
 def get_registry_folder() -> Path:
@@ -168,16 +170,20 @@ class Registry:
 
         local_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Read all data first
+        if not encryption_key:
+            # Stream straight to disk instead of holding the whole file in memory
+            with open(local_path, "wb") as f:
+                shutil.copyfileobj(result, f, DOWNLOAD_CHUNK_SIZE)
+            return
+
+        # Decryption needs the whole payload, so read all data first
         data = result.read()
 
-        # Decrypt if necessary
-        if encryption_key:
-            try:
-                data = FileEncryption.decrypt_data(data, encryption_key)
-            except Exception as e:
-                print(f"Error: Failed to decrypt file {path}: {str(e)}")
-                # Continue with encrypted data - user might want to decrypt manually
+        try:
+            data = FileEncryption.decrypt_data(data, encryption_key)
+        except Exception as e:
+            print(f"Error: Failed to decrypt file {path}: {str(e)}")
+            # Continue with encrypted data - user might want to decrypt manually
 
         with open(local_path, "wb") as f:
             f.write(data)
@@ -130,29 +130,30 @@ class InferenceClient(object):
         openai.timeout = DEFAULT_TIMEOUT
         openai.max_retries = DEFAULT_MAX_RETRIES
 
+        # The arguments do not change between retries, so build them once
+        completion_args = {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+            "custom_llm_provider": self._config.custom_llm_provider,
+            "input_cost_per_token": 0,
+            "output_cost_per_token": 0,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "base_url": self._config.base_url,
+            "api_key": self._auth,
+            "timeout": DEFAULT_TIMEOUT,
+            "request_timeout": DEFAULT_TIMEOUT,
+            "num_retries": 1,
+        }
+        # Only add provider parameter if base_url is different from default_provider
+        if self._config.base_url != self._config.default_provider:
+            completion_args["provider"] = provider
+        # Add any additional kwargs
+        completion_args.update(kwargs)
+
         for i in range(0, self._config.num_inference_retries):
             try:
-                # Create a dictionary for the arguments
-                completion_args = {
-                    "model": model,
-                    "messages": messages,
-                    "stream": stream,
-                    "custom_llm_provider": self._config.custom_llm_provider,
-                    "input_cost_per_token": 0,
-                    "output_cost_per_token": 0,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                    "base_url": self._config.base_url,
-                    "api_key": self._auth,
-                    "timeout": DEFAULT_TIMEOUT,
-                    "request_timeout": DEFAULT_TIMEOUT,
-                    "num_retries": 1,
-                }
-                # Only add provider parameter if base_url is different from default_provider
-                if self._config.base_url != self._config.default_provider:
-                    completion_args["provider"] = provider
-                # Add any additional kwargs
-                completion_args.update(kwargs)
                 result: Union[ModelResponse, CustomStreamWrapper] = litellm_completion(**completion_args)
                 break
             except Exception as e:
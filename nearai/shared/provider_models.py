@@ -59,6 +59,8 @@ def get_provider_namespaced_model(provider_model: str, provider: Optional[str] =
 class ProviderModels:
     def __init__(self, config: ClientConfig) -> None:  # noqa: D107
         self._config = config
+        # (model, provider) -> (provider, model_full_path). Resolved once, then reused for every completion.
+        self._matches: Dict[Tuple[str, Optional[str]], Tuple[str, str]] = {}
 
     @cached_property
     def provider_models(self) -> Dict[NamespacedName, Dict[str, str]]:
@@ -102,6 +104,12 @@ class ProviderModels:
         """
         if provider == "":
             provider = None
+        key = (model, provider)
+        if key not in self._matches:
+            self._matches[key] = self._match_provider_model(model, provider)
+        return self._matches[key]
+
+    def _match_provider_model(self, model: str, provider: Optional[str]) -> Tuple[str, str]:
         matched_provider, namespaced_model = get_provider_namespaced_model(model, provider)
         if matched_provider.startswith("https://"):
             return matched_provider, namespaced_model.name
@@ -5,6 +5,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+MAX_IDLE_SLEEP = 10.0
+
 
 @dataclass
 class Log:
@@ -33,13 +35,25 @@ class TensorboardCli:
         if not next_id_path.exists():
             next_id_path.write_text("0")
 
+        # This process is the only writer of the file, so read it once and track progress in memory
+        next_id = int(next_id_path.read_text())
+        saved_next_id = next_id
+        idle_sleep: float = timeout
+        # A `timeout` above MAX_IDLE_SLEEP is respected rather than shortened
+        max_idle_sleep = max(timeout, MAX_IDLE_SLEEP)
+
         while True:
-            next_id = int(next_id_path.read_text())
             result = get_logs("tensorboard", next_id, limit)
 
             if not result:
-                time.sleep(timeout)
+                if next_id != saved_next_id:
+                    next_id_path.write_text(str(next_id))
+                    saved_next_id = next_id
+                # Back off while there is nothing new, so an idle feed does not poll once per `timeout`
+                time.sleep(idle_sleep)
+                idle_sleep = min(idle_sleep * 2, max_idle_sleep)
                 continue
+            idle_sleep = timeout
 
             for row in result:
                 when = row.time.timestamp()
@@ -63,4 +77,7 @@ class TensorboardCli:
 
             new_num_logs = len(result)
             print(f"Downloaded {new_num_logs} new logs")
-            next_id_path.write_text(str(next_id))
+            # While a backlog is drained in full batches, save progress only once the drain ends
+            if new_num_logs < limit:
+                next_id_path.write_text(str(next_id))
+                saved_next_id = next_id
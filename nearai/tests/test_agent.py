@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase, mock, skipUnless
+
+import nearai.agents.agent as agent_module
+
+
+class TestForwardProcessOutput(TestCase):
+    def test_batches_lines_per_stream(self):  # noqa: D102
+        stdout_logs, stderr_logs = [], []
+        agent_module.forward_process_output(
+            {
+                "STDOUT": (io.BytesIO(b"one\n\ntwo\nthree\n"), stdout_logs.append),
+                "STDERR": (io.BytesIO(b"oops\n"), stderr_logs.append),
+            }
+        )
+        self.assertEqual(stdout_logs, ["[AGENT STDOUT] one\ntwo\nthree"])
+        self.assertEqual(stderr_logs, ["[AGENT STDERR] oops"])
+
+    def test_flushes_full_batches(self):  # noqa: D102
+        logs = []
+        with mock.patch.object(agent_module, "TS_OUTPUT_FLUSH_LINES", 2):
+            agent_module.forward_process_output({"STDOUT": (io.BytesIO(b"a\nb\nc\n"), logs.append)})
+        self.assertEqual(logs, ["[AGENT STDOUT] a\nb", "[AGENT STDOUT] c"])
+
+    def test_without_callback(self):  # noqa: D102
+        agent_module.forward_process_output({"STDOUT": (io.BytesIO(b"ignored\n"), None)})
+
+
+AGENT_SOURCE = """
+def helper():
+    return 1
+
+
+class Agent:
+    def run(self):
+        return helper()
+"""
+
+
+class TestCompileAgentCode(TestCase):
+    def setUp(self):  # noqa: D102
+        agent_module.compile_agent_code.cache_clear()
+        agent_module.compile_agent_source.cache_clear()
+
+    def write_agent(self, source):  # noqa: D102
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        path = os.path.join(temp_dir, agent_module.AGENT_FILENAME_PY)
+        with open(path, "w") as f:
+            f.write(source)
+        return path
+
+    def compile(self, path):  # noqa: D102
+        stat = os.stat(path)
+        return agent_module.compile_agent_code(path, stat.st_mtime_ns, stat.st_size)
+
+    def test_recompiles_when_file_changes(self):  # noqa: D102
+        path = self.write_agent("value = 1\n")
+        first = self.compile(path)
+        self.assertIs(self.compile(path), first)
+
+        with open(path, "w") as f:
+            f.write("value = 22\n")
+        namespace: dict = {}
+        exec(self.compile(path), namespace)
+        self.assertEqual(namespace["value"], 22)
+
+    def test_same_source_in_new_dir_reuses_compiled_code(self):  # noqa: D102
+        first_path = self.write_agent(AGENT_SOURCE)
+        second_path = self.write_agent(AGENT_SOURCE)
+        self.compile(first_path)
+
+        code = self.compile(second_path)
+
+        self.assertEqual(agent_module.compile_agent_source.cache_info().hits, 1)
+        namespace: dict = {}
+        exec(code, namespace)
+        self.assertEqual(code.co_filename, second_path)
+        self.assertEqual(namespace["helper"].__code__.co_filename, second_path)
+        self.assertEqual(namespace["Agent"].run.__code__.co_filename, second_path)
+
+    def test_syntax_error_reports_agent_path(self):  # noqa: D102
+        path = self.write_agent("def broken(:\n")
+        with self.assertRaises(SyntaxError) as context:
+            self.compile(path)
+        self.assertEqual(context.exception.filename, path)
+
+
+@skipUnless(hasattr(os, "fork"), "requires os.fork")
+class TestRunAsAgentRunnerUser(TestCase):
+    def run_agent(self, source):  # noqa: D102
+        agent = agent_module.Agent(
+            "user.near/forked/0.0.1",
+            [{"filename": agent_module.AGENT_FILENAME_PY, "content": source}],
+            {"name": "forked", "version": "0.0.1"},
+            change_to_temp_dir=False,
+        )
+        self.addCleanup(shutil.rmtree, agent.temp_dir, ignore_errors=True)
+        env = SimpleNamespace(agent_runner_user="agent_runner", user_auth=None, env_vars={})
+
+        user_info = SimpleNamespace(pw_uid=os.getuid(), pw_gid=os.getgid())
+        with mock.patch("pwd.getpwnam", return_value=user_info) as getpwnam, mock.patch("os.setgid"):
+            with mock.patch("os.setuid"), mock.patch("os.fork", wraps=os.fork) as fork:
+                result = agent.run(env)
+        fork.assert_called_once()
+        # The user switch happens in the child only
+        getpwnam.assert_not_called()
+        return result
+
+    def test_successful_agent(self):  # noqa: D102
+        self.assertEqual(self.run_agent("value = 1\n"), (None, None))
+
+    def test_failing_agent_reports_exit_code(self):  # noqa: D102
+        error_message, _ = self.run_agent("raise RuntimeError('boom')\n")
+        self.assertEqual(error_message, "Agent process exited with code 1")
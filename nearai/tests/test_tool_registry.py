@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from nearai.agents.tool_registry import ToolRegistry
+
+
+def get_weather(location: str) -> str:
+    """Get the current weather in a given location.
+
+    location: The city and state, e.g. San Francisco, CA
+    """
+    return location
+
+
+class TestToolRegistry(TestCase):
+    def test_tool_definition_is_copied(self):  # noqa: D102
+        registry = ToolRegistry()
+        registry.register_tool(get_weather)
+
+        definition = registry.get_tool_definition("get_weather")
+        assert definition is not None
+        definition["function"]["strict"] = True
+        definition["function"]["parameters"]["properties"].clear()
+
+        fresh = registry.get_all_tool_definitions()[0]
+        self.assertNotIn("strict", fresh["function"])
+        self.assertIn("location", fresh["function"]["parameters"]["properties"])